@@ -0,0 +1,20 @@
+"""
+countries.py
+-----------------
+EU-27 country codes shared by the download scripts.
+
+ISO2 codes follow ISO 3166-1 (Greece → GR, not Eurostat's EL).
+"""
+
+# ISO3 → ISO2 for the EU-27
+ISO3_TO_ISO2 = {
+    "AUT": "AT", "BEL": "BE", "BGR": "BG", "CYP": "CY", "CZE": "CZ",
+    "DEU": "DE", "DNK": "DK", "EST": "EE", "ESP": "ES", "FIN": "FI",
+    "FRA": "FR", "GRC": "GR", "HRV": "HR", "HUN": "HU", "IRL": "IE",
+    "ITA": "IT", "LTU": "LT", "LUX": "LU", "LVA": "LV", "MLT": "MT",
+    "NLD": "NL", "POL": "PL", "PRT": "PT", "ROU": "RO", "SWE": "SE",
+    "SVN": "SI", "SVK": "SK",
+}
+
+# --- EU countries (ISO3 codes) ---
+EU3 = list(ISO3_TO_ISO2)
@@ -3,80 +3,84 @@ covid_download.py
 -----------------------
 Downloads global COVID-19 case data (Our World in Data),
 aggregates monthly totals per 100k population,
-and saves an EU-only country-month CSV.
+and saves an EU-only country-month dataset.
 
 Output:
-    data/raw/covid.csv
+    data/raw/covid.parquet  (+ data/raw/covid.csv with --csv)
 """
 
-import pandas as pd
+import sys
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 from pathlib import Path
-import requests
-from io import StringIO
-import pycountry  # for ISO3 → ISO2 conversion
 
-OUT = Path("data/raw/covid.csv")
+from .countries import EU3, ISO3_TO_ISO2
+from .http_cache import CACHE_DIR, fetch_cached
+from .storage import as_region_category, enable_copy_on_write, floor_month, save_frame
+
+OUT = Path("data/raw/covid.parquet")
 OUT.parent.mkdir(parents=True, exist_ok=True)
 
-def download_covid():
+URL = "https://raw.githubusercontent.com/owid/covid-19-data/master/public/data/owid-covid-data.csv"
+CACHE = CACHE_DIR / "owid-covid-data.csv"
+
+# Columns read from the OWID file and their Arrow types
+OWID_COLUMNS = {
+    "iso_code": pa.dictionary(pa.int32(), pa.string()),  # → pandas categorical
+    "date": pa.timestamp("s"),
+    "new_cases": pa.float32(),
+    "population": pa.float64(),
+}
+
+def download_covid(write_csv: bool = False):
     print("🦠 Downloading COVID-19 cases from Our World in Data...")
 
-    url = "https://raw.githubusercontent.com/owid/covid-19-data/master/public/data/owid-covid-data.csv"
     try:
-        r = requests.get(url, timeout=60)
-        r.raise_for_status()
-        df = pd.read_csv(
-            StringIO(r.text),
-            usecols=["iso_code", "location", "date", "new_cases", "population"]
+        # Revalidate the on-disk copy (ETag / Last-Modified) instead of re-downloading
+        path = fetch_cached(URL, CACHE)
+        table = pacsv.read_csv(
+            path,
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(OWID_COLUMNS),
+                column_types=OWID_COLUMNS,
+            ),
         )
-        print(f"✅ Successfully loaded data from {url}")
+        print(f"✅ Successfully loaded data from {URL}")
     except Exception as e:
         raise RuntimeError(f"❌ Failed to download OWID data: {e}")
 
-    # --- Clean and aggregate ---
-    df = df[df["iso_code"].str.len() == 3]  # only ISO3 country codes
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df = df.dropna(subset=["date", "population"])
-    df["month"] = df["date"].dt.to_period("M").dt.to_timestamp()
+    # --- Clean (in Arrow): EU countries only, which also drops OWID_* aggregates ---
+    keep = pc.and_(
+        pc.is_in(table["iso_code"], value_set=pa.array(EU3)),
+        pc.and_(pc.is_valid(table["date"]), pc.is_valid(table["population"])),
+    )
+    df = table.filter(keep).to_pandas()
+
+    # --- Aggregate ---
+    df["month"] = floor_month(df["date"])
 
     # Cases per 100k population
     df["cases_per_100k"] = (df["new_cases"] / df["population"]) * 100_000
 
-    # Monthly aggregation
+    # Monthly aggregation (unsorted hash groupby; rows are sorted by region below)
     monthly = (
-        df.groupby(["iso_code", "month"], as_index=False)
+        df.groupby(["iso_code", "month"], as_index=False, observed=True, sort=False)
         .agg({"cases_per_100k": "sum"})
     )
 
-    # --- EU countries (ISO3 codes) ---
-    EU3 = [
-        "AUT","BEL","BGR","CYP","CZE","DEU","DNK","EST","ESP","FIN","FRA","GRC","HRV","HUN",
-        "IRL","ITA","LTU","LUX","LVA","MLT","NLD","POL","PRT","ROU","SWE","SVN","SVK"
-    ]
-    monthly = monthly[monthly["iso_code"].isin(EU3)]
-
-    # --- Convert ISO3 → ISO2 and rename to 'region' ---
-    def iso3_to_iso2(code: str) -> str | None:
-        """Convert ISO3 country code to ISO2; return None if not found."""
-        try:
-            country = pycountry.countries.get(alpha_3=code)
-            if country is not None:
-                return country.alpha_2
-            return None
-        except Exception as _:
-            # Optional: log or print(f"⚠️ Could not convert {code}: {e}")
-            return None
-
-    monthly["region"] = monthly["iso_code"].apply(iso3_to_iso2)
+    # --- Convert ISO3 → ISO2 and rename to 'region' (unknown codes → NaN) ---
+    monthly["region"] = as_region_category(monthly["iso_code"].map(ISO3_TO_ISO2))
 
     # --- Select, reorder, and sort ---
     monthly = monthly[["month", "region", "cases_per_100k"]]
     monthly = monthly.sort_values(by=["region", "month"]).reset_index(drop=True)
 
     # --- Save ---
-    monthly.to_csv(OUT, index=False)
-    print(f"💾 Saved EU-only dataset → {OUT.resolve()} ({len(monthly):,} rows, {monthly['region'].nunique()} countries)")
+    out = save_frame(monthly, OUT, write_csv=write_csv)
+    print(f"💾 Saved EU-only dataset → {out.resolve()} ({len(monthly):,} rows, {monthly['region'].nunique()} countries)")
     print("📆 Date range:", monthly['month'].min(), "→", monthly['month'].max())
 
 if __name__ == "__main__":
-    download_covid()
+    enable_copy_on_write()
+    download_covid(write_csv="--csv" in sys.argv)
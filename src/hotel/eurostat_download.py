@@ -9,48 +9,11 @@ with OWID COVID, exchange rates, and policy stringency data.
 - Robust to missing 'region' columns (e.g., FX rates)
 - Sorted, validated, and ready for modeling
 
-Output → data/interim/hotel.csv
+Output → data/interim/hotel.parquet (+ hotel.csv copy read by the notebooks)
 """
 
-import pandas as pd
-from pathlib import Path
-
-# ---------------------------------------------------------------------
-# CONFIGURATION
-# ---------------------------------------------------------------------
-RAW = Path("data/raw")
-OUT = Path("data/interim/hotel.csv")
-OUT.parent.mkdir(parents=True, exist_ok=True)
-
-
-# ---------------------------------------------------------------------
-# HELPERS
-# ---------------------------------------------------------------------
-def load_dataset(name: str) -> pd.DataFrame:
-    """Load dataset safely from /data/raw/ and check expected columns."""
-    path = RAW / f"{name}.csv"
-    if not path.exists():
-        print(f"⚠️ {name} not found → skipping merge.")
-        return pd.DataFrame()
-
-    df = pd.read_csv(path)
-
-    # Check for 'month' column
-    if "month" not in df.columns:
-        raise KeyError(f"❌ {name} missing 'month' column")
-
-    # Normalize month format
-    df["month"] = pd.to_datetime(df["month"], errors="coerce").dt.strftime("%Y-%m-%d")
-
-    # Normalize region codes if available
-    if "region" in df.columns:
-        df["region"] = df["region"].astype(str).str.upper().str.strip()
-        region_info = f"{df['region'].nunique()} countries"
-    else:
-        region_info = "no region column"
-
-    print(f"✅ Loaded {name:<18} → {len(df):>7,} rows | {region_info}")
-    return df
+from .panel import build_panel, completeness_by_year, non_monotonic_regions
+from .storage import enable_copy_on_write
 
 
 # ---------------------------------------------------------------------
@@ -58,60 +21,15 @@ def load_dataset(name: str) -> pd.DataFrame:
 # ---------------------------------------------------------------------
 def merge_datasets():
     print("📥 Merging Eurostat, COVID, FX rates, and Policy Stringency datasets...")
-
-    # --- Load datasets ---
-    euro = load_dataset("eurostat")
-    covid = load_dataset("covid")
-    fx = load_dataset("fx_rates")
-    policy = load_dataset("policy_stringency")
-
-    if euro.empty:
-        raise FileNotFoundError("Eurostat data is required as the base dataset.")
-
-    # --- Harmonize COVID column naming ---
-    if not covid.empty and "cases_per_100k" in covid.columns:
-        covid = covid.rename(columns={"cases_per_100k": "covid_cases"})
-
-    # --- Merge step-by-step ---
-    merged = euro.copy()
-
-    # COVID
-    if not covid.empty:
-        merged = merged.merge(
-            covid[["region", "month", "covid_cases"]],
-            on=["region", "month"],
-            how="left",
-        )
-
-    # FX rates (no region)
-    if not fx.empty:
-        fx = fx.rename(columns={"time": "month"}) if "time" in fx.columns else fx
-        merged = merged.merge(fx[["month", "eurusd", "eurgbp"]], on="month", how="left")
-
-    # Policy Stringency
-    if not policy.empty:
-        merged = merged.merge(
-            policy[["region", "month", "policy_stringency"]],
-            on=["region", "month"],
-            how="left",
-        )
-
-    # --- Sort and clean ---
-    merged = merged.drop_duplicates(["region", "month"]).sort_values(["region", "month"])
-    merged.reset_index(drop=True, inplace=True)
-
-    # --- Save ---
-    merged.to_csv(OUT, index=False)
-    print(f"💾 Saved merged dataset → {OUT.resolve()} ({len(merged):,} rows)")
+    merged = build_panel()
 
     # --- Validation checks ---
     print("\n🔍 Validating dataset consistency...")
 
     # 1️⃣ Monotonic month order per country
     try:
-        grouped = merged.groupby("region")["month"].apply(lambda x: x.is_monotonic_increasing)
-        if not grouped.all():
-            bad = grouped[~grouped].index.tolist()
+        bad = non_monotonic_regions(merged)
+        if bad:
             print(f"⚠️ Non-monotonic month order detected for: {bad}")
         else:
             print("✅ All countries have monotonic month sequence.")
@@ -119,25 +37,11 @@ def merge_datasets():
         print(f"⚠️ Could not validate month order: {e}")
 
     # 2️⃣ Completeness summary
-    merged["year"] = pd.to_datetime(merged["month"]).dt.year
-    cols = [
-        "nights_spent",
-        "gdp",
-        "unemployment_rate",
-        "turnover_index",
-        "hicp_index",
-        "covid_cases",
-        "eurusd",
-        "eurgbp",
-        "policy_stringency",
-    ]
-    available = [c for c in cols if c in merged.columns]
-    completeness = merged.groupby("year")[available].apply(lambda x: x.notna().mean().round(2))
-
     print("\n📊 Non-null share by year:")
-    print(completeness.tail(10))
+    print(completeness_by_year(merged).tail(10))
 
 
 # ---------------------------------------------------------------------
 if __name__ == "__main__":
+    enable_copy_on_write()
     merge_datasets()
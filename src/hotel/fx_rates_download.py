@@ -5,43 +5,44 @@ Downloads monthly EUR/USD and EUR/GBP exchange rates
 from Yahoo Finance (raw values, single header, Python-friendly format).
 
 Output:
-    data/raw/fx_rates.csv
+    data/raw/fx_rates.parquet  (+ data/raw/fx_rates.csv with --csv)
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import yfinance as yf
 from pathlib import Path
 
+from .storage import enable_copy_on_write, save_frame
+
 RAW = Path("data/raw")
-OUT = RAW / "fx_rates.csv"
+OUT = RAW / "fx_rates.parquet"
 RAW.mkdir(parents=True, exist_ok=True)
 
+# Yahoo ticker → output column
+TICKERS = {"EURUSD=X": "eurusd", "EURGBP=X": "eurgbp"}
 
-def download_exchange_rates():
-    print("📡 Downloading monthly exchange rates from Yahoo Finance...")
 
-    # Download both tickers at once (EUR/USD, EUR/GBP)
-    data = yf.download(
-        ["EURUSD=X", "EURGBP=X"],
-        start="2010-01-01",
-        interval="1mo",
-        progress=False
-    )
+def fetch_close(ticker: str) -> pd.Series:
+    """Monthly close prices for one ticker, indexed by tz-naive date."""
+    close = yf.Ticker(ticker).history(start="2010-01-01", interval="1mo")["Close"]
+    close.index = close.index.tz_localize(None)
+    return close.rename(TICKERS[ticker])
 
-    if not isinstance(data, pd.DataFrame) or data.empty:
-        raise ValueError("❌ Yahoo Finance returned no data for EURUSD=X or EURGBP=X")
 
-    # Flatten MultiIndex and keep 'Close' prices
-    if isinstance(data.columns, pd.MultiIndex):
-        data = data["Close"].copy()
+def download_exchange_rates(write_csv: bool = False):
+    print("📡 Downloading monthly exchange rates from Yahoo Finance...")
 
-    # If single ticker, convert to DataFrame
-    if isinstance(data, pd.Series):
-        data = data.to_frame()
+    # Fetch both tickers concurrently (EUR/USD, EUR/GBP): each is one blocking HTTP round-trip
+    with ThreadPoolExecutor(max_workers=len(TICKERS)) as pool:
+        closes = list(pool.map(fetch_close, TICKERS))
 
-    # Rename columns for clarity
-    data = data.rename(columns={"EURUSD=X": "eurusd", "EURGBP=X": "eurgbp"}).reset_index()
+    if any(c.empty for c in closes):
+        raise ValueError("❌ Yahoo Finance returned no data for EURUSD=X or EURGBP=X")
+
+    # One column per ticker, aligned on date
+    data = pd.concat(closes, axis=1).rename_axis("Date").reset_index()
 
     # Normalize date column
     data["month"] = pd.to_datetime(data["Date"], errors="coerce") + pd.offsets.MonthBegin(0)
@@ -53,30 +54,28 @@ def download_exchange_rates():
     # 🧭 Trim to analysis period (2015–2025)
     data = data[data["month"].between("2015-01-01", "2025-08-01")]
 
-    # Format month as string YYYY-MM-DD
-    data["month"] = data["month"].dt.strftime("%Y-%m-%d")
-
     # Sort and reset
     data = data.sort_values("month").reset_index(drop=True)
 
-    # Save
-    data.to_csv(OUT, index=False)
+    # Save (month stays datetime64 in Parquet)
+    save_frame(data, OUT, write_csv=write_csv)
     print(f"💾 Saved → {OUT.resolve()} ({len(data):,} rows)")
-    print(f"📆 Coverage: {data['month'].min()} → {data['month'].max()}")
+    print(f"📆 Coverage: {data['month'].min():%Y-%m-%d} → {data['month'].max():%Y-%m-%d}")
     print(data.head(3))
 
 
-def main(force: bool = False):
+def main(force: bool = False, write_csv: bool = False):
     if OUT.exists() and not force:
         print(f"✅ Using cached file → {OUT.resolve()}")
         return
     try:
-        download_exchange_rates()
+        download_exchange_rates(write_csv=write_csv)
     except Exception as e:
         print(f"❌ Yahoo Finance fetch failed: {e}")
         print("⚠️ No data fetched. Please check your internet connection or Yahoo API status.")
 
 
 if __name__ == "__main__":
+    enable_copy_on_write()
     force = "--force" in sys.argv
-    main(force=force)
+    main(force=force, write_csv="--csv" in sys.argv)
@@ -0,0 +1,69 @@
+"""
+http_cache.py
+-----------------
+Conditional-GET download cache for large upstream files.
+
+The response body is streamed to disk and its ETag / Last-Modified
+headers are kept in a small JSON sidecar. Later calls revalidate with
+If-None-Match / If-Modified-Since and reuse the local copy on 304,
+so an unchanged upstream file costs one header round-trip.
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import requests
+
+# ---------------------------------------------------------------------
+# CONFIGURATION
+# ---------------------------------------------------------------------
+CACHE_DIR = Path("data/raw/.cache")
+CHUNK_SIZE = 1 << 20  # 1 MiB copy buffer
+
+
+# ---------------------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------------------
+def _meta_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.meta.json")
+
+
+def fetch_cached(url: str, path: Path, timeout: int = 60) -> Path:
+    """Download url to path, revalidating an existing copy instead of re-fetching it."""
+    path = Path(path)
+    meta_path = _meta_path(path)
+
+    headers = {}
+    if path.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+        if meta.get("url") == url:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as r:
+        if r.status_code == 304:
+            print(f"✅ Upstream unchanged → using cached copy {path.resolve()}")
+            return path
+        r.raise_for_status()
+        r.raw.decode_content = True  # transparently handle gzip encoding
+
+        # Stream to a temporary file first so an interrupted download never
+        # leaves a truncated cache behind
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.part")
+        with open(tmp, "wb") as f:
+            shutil.copyfileobj(r.raw, f, CHUNK_SIZE)
+        tmp.replace(path)
+
+        meta = {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }
+        meta_path.write_text(json.dumps(meta, indent=2))
+
+    print(f"📥 Downloaded {url} → {path.resolve()}")
+    return path
@@ -0,0 +1,178 @@
+"""
+panel.py
+-----------------
+Builds the region × month panel shared by the merge entry points
+(hotel_merge, eurostat_download): Eurostat as the base, left-joined
+with OWID COVID, exchange rates, and policy stringency data.
+
+- All datasets aligned on region (ISO2) and month (datetime64, first of month)
+- No transformations or imputations
+- Parsed inputs are memoized per (file, mtime) within a process
+
+Output → data/interim/hotel.parquet (+ hotel.csv copy read by the notebooks)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from .storage import find_frame, read_frame, save_frame, share_region_categories
+
+# ---------------------------------------------------------------------
+# CONFIGURATION
+# ---------------------------------------------------------------------
+RAW = Path("data/raw")
+OUT = Path("data/interim/hotel.parquet")
+
+# Columns each input contributes to the panel (None: all, for the Eurostat base)
+COLUMNS = {
+    "eurostat": None,
+    "covid": ["region", "month", "cases_per_100k"],
+    "fx_rates": ["month", "time", "eurusd", "eurgbp"],
+    "policy_stringency": ["region", "month", "policy_stringency"],
+}
+
+# Pinned column types for inputs that only exist as CSV (skips type inference)
+DTYPES = {
+    "eurostat": {
+        "region": "category",
+        "nights_spent": "float64",
+        "gdp": "float64",
+        "unemployment_rate": "float64",
+        "turnover_index": "float64",
+        "hicp_index": "float64",
+    },
+    "covid": {"region": "category", "cases_per_100k": "float64"},
+    "fx_rates": {"eurusd": "float64", "eurgbp": "float64"},
+    "policy_stringency": {"region": "category", "policy_stringency": "float64"},
+}
+
+SUMMARY_COLS = [
+    "nights_spent",
+    "gdp",
+    "unemployment_rate",
+    "turnover_index",
+    "hicp_index",
+    "covid_cases",
+    "eurusd",
+    "eurgbp",
+    "policy_stringency",
+]
+
+
+# ---------------------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def _read_normalized(path: Path, mtime: float) -> pd.DataFrame:
+    """Read and normalize one input; mtime is part of the key so edited files are re-read."""
+    df = read_frame(path, columns=COLUMNS.get(path.stem), dtype=DTYPES.get(path.stem))
+    if "month" not in df.columns:
+        raise KeyError(f"❌ {path.stem} missing 'month' column")
+
+    # Keep month as datetime64 (int64-backed) so joins hash integer keys, not strings
+    df = df.assign(month=pd.to_datetime(df["month"], errors="coerce").astype("datetime64[ns]"))
+
+    if "region" in df.columns:
+        df = df.assign(region=df["region"].str.upper().str.strip().astype("category"))
+    return df
+
+
+def _parse_input(name: str, raw_dir: Path) -> None:
+    """Parse one input into the _read_normalized memo without printing (safe in worker threads)."""
+    path = find_frame(Path(raw_dir) / name)
+    if path is not None:
+        _read_normalized(path, path.stat().st_mtime)
+
+
+def load_dataset(name: str, raw_dir: Path = RAW) -> pd.DataFrame:
+    """Load dataset safely from raw_dir (Parquet or CSV) and check expected columns."""
+    path = find_frame(Path(raw_dir) / name)
+    if path is None:
+        print(f"⚠️ {name} not found → skipping merge.")
+        return pd.DataFrame()
+
+    # Copy, so edits by the caller never reach the memoized frame
+    df = _read_normalized(path, path.stat().st_mtime).copy()
+
+    region_info = f"{df['region'].nunique()} countries" if "region" in df.columns else "no region column"
+    print(f"✅ Loaded {name:<18} → {len(df):>7,} rows | {region_info}")
+    return df
+
+
+def non_monotonic_regions(panel: pd.DataFrame) -> list[str]:
+    """Regions whose months go backwards in a panel sorted by (region, month)."""
+    # Compare neighbouring rows within each region in one vectorized pass
+    m = panel["month"].to_numpy().view("i8")
+    r = panel["region"].cat.codes.to_numpy()
+    bad_mask = (r[1:] == r[:-1]) & (m[1:] < m[:-1])
+    return panel["region"].iloc[1:][bad_mask].unique().tolist()
+
+
+def completeness_by_year(panel: pd.DataFrame) -> pd.DataFrame:
+    """Share of non-null values per summary column and year."""
+    # Nullable Int16: NaT months (coerced on load) become <NA> and drop out of the groupby
+    year = panel["month"].dt.year.astype("Int16").rename("year")
+    available = [c for c in SUMMARY_COLS if c in panel.columns]
+    return panel[available].notna().groupby(year).mean().round(2)
+
+
+# ---------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------
+def build_panel(raw_dir: Path = RAW, out: Path | None = OUT, write_csv: bool = True) -> pd.DataFrame:
+    """Merge the raw datasets on (region, month); saved to out unless it is None."""
+    # --- Load each dataset (independent reads; Arrow parsing releases the GIL) ---
+    # Workers only parse into the memo; the log lines are printed here, in order
+    names = ["eurostat", "covid", "fx_rates", "policy_stringency"]
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        list(pool.map(lambda name: _parse_input(name, raw_dir), names))
+    euro, covid, fx, policy = (load_dataset(name, raw_dir) for name in names)
+
+    if euro.empty:
+        raise FileNotFoundError("Eurostat data is required as the base dataset.")
+
+    # --- Harmonize column names for clarity ---
+    if "cases_per_100k" in covid.columns:
+        covid = covid.rename(columns={"cases_per_100k": "covid_cases"})
+    if "time" in fx.columns:
+        fx = fx.rename(columns={"time": "month"})
+
+    # --- One shared region category set → joins on int codes ---
+    euro, covid, policy = share_region_categories(euro, covid, policy)
+
+    # --- Join all datasets on a (region, month) index built once on the base ---
+    # Right-hand keys are deduplicated first (keeping the first row, as the final
+    # drop_duplicates did), so each join is many-to-one and never fans out rows
+    keys = ["region", "month"]
+    merged = euro.set_index(keys)
+
+    if not covid.empty:
+        right = covid.drop_duplicates(keys).set_index(keys)["covid_cases"]
+        merged = merged.join(right, how="left", sort=False, validate="many_to_one")
+
+    if not fx.empty:
+        # fx has no region: joins on the shared 'month' index level
+        right = fx.drop_duplicates("month").set_index("month")[["eurusd", "eurgbp"]]
+        merged = merged.join(right, how="left", sort=False, validate="many_to_one")
+
+    if not policy.empty:
+        right = policy.drop_duplicates(keys).set_index(keys)["policy_stringency"]
+        merged = merged.join(right, how="left", sort=False, validate="many_to_one")
+
+    # Restore the Eurostat column order, with joined columns appended
+    merged = merged.reset_index()
+    merged = merged[list(euro.columns) + [c for c in merged.columns if c not in euro.columns]]
+
+    # --- Final formatting ---
+    merged = merged.drop_duplicates(["region", "month"]).sort_values(["region", "month"])
+    merged.reset_index(drop=True, inplace=True)
+
+    # --- Save output ---
+    if out is not None:
+        out = save_frame(merged, out, write_csv=write_csv)
+        print(f"💾 Saved merged dataset → {out.resolve()} ({len(merged):,} rows)")
+
+    return merged
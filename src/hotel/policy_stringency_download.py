@@ -1,16 +1,14 @@
-# Safe SSL context setup (prevents CERTIFICATE_VERIFY_FAILED on some systems)
-import ssl
-import certifi
-
-try:
-    ssl._create_default_https_context = lambda: ssl.create_default_context(cafile=certifi.where())
-except Exception:
-    # Fallback (not ideal, but avoids crashes)
-    ssl._create_default_https_context = ssl._create_unverified_context
-
+import csv
+import sys
 from pathlib import Path
-import pandas as pd
-import pycountry
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from .countries import EU3, ISO3_TO_ISO2
+from .http_cache import CACHE_DIR, fetch_cached
+from .storage import as_region_category, enable_copy_on_write, save_frame
 
 """
 policy_stringency_download.py
@@ -18,105 +16,111 @@ policy_stringency_download.py
 Downloads Oxford COVID-19 Government Response Tracker (OxCGRT)
 policy stringency index (0–100) and aggregates it to monthly MEAN values per country.
 
-Output: data/raw/policy_stringency.csv
+Output: data/raw/policy_stringency.parquet  (+ .csv with --csv)
 """
 
 # ---------------------------------------------------------------------
 # CONFIGURATION
 # ---------------------------------------------------------------------
-OUT = Path("data/raw/policy_stringency.csv")
+OUT = Path("data/raw/policy_stringency.parquet")
 OUT.parent.mkdir(parents=True, exist_ok=True)
 
 URL = "https://raw.githubusercontent.com/OxCGRT/covid-policy-tracker/master/data/OxCGRT_nat_latest.csv"
+CACHE = CACHE_DIR / "OxCGRT_nat_latest.csv"
+
+# Stringency column names used across OxCGRT releases (first present one wins)
+STRINGENCY_COLUMNS = [
+    "StringencyIndex",
+    "StringencyIndex_Average",
+    "StringencyIndex_ForDisplay",
+    "StringencyIndex_Average_ForDisplay",
+]
 
 
 # ---------------------------------------------------------------------
 # MAIN
 # ---------------------------------------------------------------------
-def main(force=False):
+def main(force=False, write_csv=False):
     if OUT.exists() and not force:
         print(f"✅ Using cached file → {OUT.resolve()}")
         return
 
     print("📥 Downloading Oxford COVID-19 Stringency Index data...")
-    df = pd.read_csv(URL, low_memory=False)
-
-    # Detect the correct stringency column
-    possible_cols = [
-        "StringencyIndex",
-        "StringencyIndex_Average",
-        "StringencyIndex_ForDisplay",
-        "StringencyIndex_Average_ForDisplay",
-    ]
-    str_col = next((c for c in possible_cols if c in df.columns), None)
-    if not str_col:
-        raise ValueError(f"No recognized stringency column found. Columns: {df.columns[:20].tolist()}")
-
-    # Select relevant columns
-    cols = ["CountryCode", "Date", str_col]
-    df = df[cols].rename(columns={str_col: "policy_stringency"})
-
-    # Parse and standardize dates
-    df["Date"] = df["Date"].astype(str).str.zfill(8)  # Ensure YYYYMMDD
-    df["date"] = pd.to_datetime(df["Date"], format="%Y%m%d", errors="coerce")
-    df = df.dropna(subset=["date"])
-
-    # Convert to monthly mean and align to first day of month
-    # Represent month as YYYY-MM-DD string for first day of month
-    df["month"] = df["date"].dt.to_period("M").astype(str) + "-01"
-
+    # Revalidate the on-disk copy (ETag / Last-Modified) instead of re-downloading
+    path = fetch_cached(URL, CACHE)
+
+    with open(path, "rb") as f:
+        # Detect the correct stringency column from the header line
+        header = next(csv.reader([f.readline().decode("utf-8-sig")]))
+        str_col = next((c for c in STRINGENCY_COLUMNS if c in header), None)
+        if not str_col:
+            raise ValueError(f"No recognized stringency column found. Columns: {header[:20]}")
+
+        # Stream the rest of the file through Arrow's CSV reader one block at a time,
+        # keeping only the needed columns and EU rows (ISO3) of each batch
+        reader = pacsv.open_csv(
+            f,
+            read_options=pacsv.ReadOptions(column_names=header),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=["CountryCode", "Date", str_col],
+                column_types={
+                    "CountryCode": pa.dictionary(pa.int32(), pa.string()),  # → pandas categorical
+                    "Date": pa.int64(),
+                    str_col: pa.float64(),
+                },
+            ),
+        )
+        eu = pa.array(EU3)
+        batches = [batch.filter(pc.is_in(batch["CountryCode"], value_set=eu)) for batch in reader]
+
+    df = pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+    df = df.rename(columns={str_col: "policy_stringency"})
+
+    # Parse and standardize dates: Date is a YYYYMMDD integer, so year and month
+    # come from integer arithmetic (no strings, no per-day datetime parsing)
+    df = df.dropna(subset=["Date"])
+    ymd = df["Date"].to_numpy(dtype=np.int64)
+    year, month, day = ymd // 10000, ymd // 100 % 100, ymd % 100
+
+    # Align to first day of month: months since 1970-01 cast straight to datetime64[M]
+    # (out-of-range months are clipped here and masked out below)
+    first = ((year - 1970) * 12 + (np.clip(month, 1, 12) - 1)).astype("datetime64[M]")
+    days_in_month = ((first + 1).astype("datetime64[D]") - first.astype("datetime64[D]")).astype(np.int64)
+
+    # Drop dates that do not exist (e.g. 20200231), as the %Y%m%d coerce/dropna did
+    valid = (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month)
+    df = df[valid]
+    df["month"] = first[valid].astype("datetime64[ns]")
+
+    # Monthly mean of the daily index (unsorted hash groupby; rows are sorted by region below)
     monthly = (
-        df.groupby(["CountryCode", "month"], as_index=False)
-        .agg({"policy_stringency": "mean"})  # monthly mean of daily index
+        df.groupby(["CountryCode", "month"], as_index=False, observed=True, sort=False)["policy_stringency"]
+        .mean()
         .rename(columns={"CountryCode": "region"})
     )
 
-    # Filter to EU only (ISO3)
-    EU3 = [
-        "AUT", "BEL", "BGR", "CYP", "CZE", "DEU", "DNK", "EST", "ESP", "FIN",
-        "FRA", "GRC", "HRV", "HUN", "IRL", "ITA", "LTU", "LUX", "LVA", "MLT",
-        "NLD", "POL", "PRT", "ROU", "SWE", "SVN", "SVK",
-    ]
-    monthly = monthly[monthly["region"].isin(EU3)]
-
-    # ✅ Convert ISO3 → ISO2 for consistency with other datasets
-    def iso3_to_iso2(iso3):
-        try:
-            # Guard against non-string and missing values
-            if not isinstance(iso3, str) or not iso3:
-                return None
-            iso3_clean = iso3.strip().upper()
-
-            # If already ISO2, return it
-            if len(iso3_clean) == 2:
-                return iso3_clean
-
-            country = pycountry.countries.get(alpha_3=iso3_clean)
-            if country and getattr(country, "alpha_2", None):
-                return country.alpha_2
-
-            return None
-        except Exception:
-            return None
-
-    monthly["region"] = monthly["region"].apply(iso3_to_iso2)
+    # ✅ Convert ISO3 → ISO2 for consistency with other datasets (one dict lookup per category)
+    monthly["region"] = monthly["region"].map(ISO3_TO_ISO2)
     monthly = monthly.dropna(subset=["region"])
+    monthly["region"] = as_region_category(monthly["region"])
 
     # ✅ Keep data between 2015-01-01 and 2025-08-01 inclusive
     monthly = monthly[monthly["month"].between("2015-01-01", "2025-08-01")]
 
-    # ✅ Sort and save
+    # ✅ Sort and save (month stored as datetime64 in Parquet)
     monthly = monthly.sort_values(["region", "month"]).reset_index(drop=True)
-    monthly.to_csv(OUT, index=False)
+    save_frame(monthly, OUT, write_csv=write_csv)
 
     print(f"💾 Saved → {OUT.resolve()} ({len(monthly):,} rows, {monthly['region'].nunique()} EU countries)")
-    print(f"🗓️ Coverage: {monthly['month'].min()} → {monthly['month'].max()}")
+    print(f"🗓️ Coverage: {monthly['month'].min():%Y-%m-%d} → {monthly['month'].max():%Y-%m-%d}")
 
     # Quick sanity check
     print("\n📊 Sample (2020):")
-    print(monthly[monthly['month'].str.startswith('2020')].head())
+    print(monthly[monthly['month'].dt.year == 2020].head())
 
 
 # ---------------------------------------------------------------------
 if __name__ == "__main__":
-    main()
+    enable_copy_on_write()
+    force = "--force" in sys.argv  # re-aggregate; the download itself is revalidated
+    main(force=force, write_csv="--csv" in sys.argv)
@@ -0,0 +1,130 @@
+"""
+storage.py
+-----------------
+Shared read/write and dtype helpers for the data acquisition scripts.
+
+Raw and interim datasets are stored as Parquet (pyarrow, zstd) so that
+dtypes — datetimes, floats, categorical region codes — survive the
+round-trip without re-parsing. A CSV copy can still be written next to
+the Parquet file for manual inspection. Inputs that only exist as CSV
+are parsed once and cached as Parquet under <dir>/.cache/.
+
+Files are written to a temporary sibling and moved into place with
+os.replace, so an interrupted run never leaves a truncated dataset that
+a later "use cached file" check would trust.
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
+
+# ---------------------------------------------------------------------
+# CONFIGURATION
+# ---------------------------------------------------------------------
+PARQUET_OPTIONS = {"engine": "pyarrow", "compression": "zstd", "index": False}
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer
+
+
+# ---------------------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------------------
+def enable_copy_on_write() -> None:
+    """Turn on pandas Copy-on-Write (filtered frames and renames share data instead of copying).
+
+    Called from the scripts' __main__ blocks only, so importing these modules
+    (e.g. from a notebook) leaves the session's pandas options untouched.
+    """
+    pd.options.mode.copy_on_write = True
+
+
+def as_region_category(s: pd.Series) -> pd.Series:
+    """Cast region codes to a categorical whose categories are sorted, so sorting matches string order."""
+    # Note: s.astype(CategoricalDtype(...)) would keep the old order for unordered categoricals
+    categories = sorted(s.dropna().unique())
+    return pd.Series(pd.Categorical(s, categories=categories), index=s.index, name=s.name)
+
+
+def share_region_categories(*frames: pd.DataFrame) -> tuple[pd.DataFrame, ...]:
+    """Recode 'region' in each frame onto one sorted category set, so joins compare int codes."""
+    with_region = [df["region"].astype("category") for df in frames if "region" in df.columns]
+    if not with_region:
+        return frames
+    categories = union_categoricals(with_region, sort_categories=True).categories
+    return tuple(
+        df.assign(region=pd.Categorical(df["region"], categories=categories)) if "region" in df.columns else df
+        for df in frames
+    )
+
+
+def floor_month(s: pd.Series) -> pd.Series:
+    """Snap datetimes to the first day of their month (datetime64[ns]) with one numpy cast."""
+    return pd.Series(s.to_numpy(dtype="datetime64[M]").astype("datetime64[ns]"), index=s.index, name=s.name)
+
+
+def save_frame(df: pd.DataFrame, out: Path, write_csv: bool = False) -> Path:
+    """Save df as Parquet at out (optionally also as a sibling .csv)."""
+    out = Path(out).with_suffix(".parquet")
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = out.with_name(f"{out.name}.tmp")
+    df.to_parquet(tmp, **PARQUET_OPTIONS)
+    os.replace(tmp, out)
+
+    if write_csv:
+        csv_out = out.with_suffix(".csv")
+        tmp = csv_out.with_name(f"{csv_out.name}.tmp")
+        with open(tmp, "wb", buffering=CSV_BUFFER_SIZE) as f:
+            df.to_csv(f, index=False)
+        os.replace(tmp, csv_out)
+
+    return out
+
+
+def find_frame(stem: Path) -> Path | None:
+    """Return the Parquet file for stem if present, else the CSV, else None."""
+    stem = Path(stem)
+    for suffix in (".parquet", ".csv"):
+        path = stem.with_suffix(suffix)
+        if path.exists():
+            return path
+    return None
+
+
+def read_frame(
+    path: Path,
+    date_cols: tuple[str, ...] = ("month",),
+    columns: list[str] | None = None,
+    dtype: dict[str, str] | None = None,
+) -> pd.DataFrame:
+    """Read a dataset written by save_frame (Parquet) or a legacy CSV.
+
+    columns limits the Parquet read to those columns (names absent from the
+    file are ignored); dtype pins CSV column types instead of inferring them.
+    """
+    path = Path(path)
+
+    # CSV: reuse the Parquet copy of a previous parse while it is newer than the CSV
+    if path.suffix != ".parquet":
+        cache = path.parent / ".cache" / f"{path.stem}.parquet"
+        if not (cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime):
+            # Parse with Arrow's multithreaded CSV reader; the full file is parsed and
+            # cached, so the cache serves any column selection.
+            header = pd.read_csv(path, nrows=0).columns
+            pinned = {c: t for c, t in (dtype or {}).items() if c in header}
+            df = pd.read_csv(path, engine="pyarrow", dtype=pinned)
+            # Dates are converted here, not by the reader: blank cells must become NaT
+            # rather than leave an object column of 'None' strings in the cache
+            for c in date_cols:
+                if c in df.columns:
+                    df[c] = pd.to_datetime(df[c], format="%Y-%m-%d", errors="coerce")
+            save_frame(df, cache)
+            return df if columns is None else df[[c for c in df.columns if c in columns]]
+        path = cache
+
+    if columns is not None:
+        names = pq.read_schema(path).names
+        columns = [c for c in names if c in columns]
+    return pd.read_parquet(path, engine="pyarrow", columns=columns)
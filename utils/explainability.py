@@ -12,8 +12,11 @@ import statsmodels.api as sm
 def compute_shap_values(model, X, background_size=500):
     """
     Compute SHAP values for tree-based models (XGBoost, LightGBM, etc.).
+    Linear sklearn models go straight to LinearExplainer.
     Includes auto-detection for pipelines and safe fallback mode.
     """
+    from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
+
     # --- Handle sklearn pipelines ---
     if hasattr(model, "named_steps") and "model" in model.named_steps:
         model = model.named_steps["model"]
@@ -22,6 +25,13 @@ def compute_shap_values(model, X, background_size=500):
     bg_size = min(background_size, len(X))
     X_bg = X.sample(bg_size, random_state=42)
 
+    # --- Known linear models: exact closed-form SHAP values, no TreeExplainer attempt ---
+    if isinstance(model, (LinearRegression, Ridge, Lasso, ElasticNet)):
+        explainer = shap.LinearExplainer(model, X_bg)
+        shap_values = explainer(X_bg)
+        print(f"✅ LinearExplainer succeeded for {model.__class__.__name__}.")
+        return explainer, shap_values
+
     # --- Try fast TreeExplainer ---
     try:
         explainer = shap.TreeExplainer(model)
@@ -62,6 +72,12 @@ def summarize_shap(shap_values, X=None, model_name="Model"):
     plt.tight_layout()
     plt.show()
 
+def _shap_matrix(shap_values) -> np.ndarray:
+    """SHAP values as a 2-D array; an Explanation's or ndarray's data is returned without copying."""
+    if isinstance(shap_values, shap.Explanation):
+        return shap_values.values
+    return np.asarray(shap_values)
+
 def dependence_plot(shap_values, X, feature_name, model_name="Model"):
     """
     Generate a SHAP dependence plot for a specific feature.
@@ -73,18 +89,12 @@ def dependence_plot(shap_values, X, feature_name, model_name="Model"):
         if X is None:
             raise ValueError("No feature data provided and shap_values.data is missing.")
 
-    # --- Extract SHAP matrix robustly ---
-    if hasattr(shap_values, "values"):
-        shap_matrix = shap_values.values
-    elif isinstance(shap_values, np.ndarray):
-        shap_matrix = shap_values
-    else:
-        shap_matrix = np.array(shap_values)
+    shap_matrix = _shap_matrix(shap_values)
 
-    # --- Safety alignment ---
+    # --- Safety alignment (basic slices are views, not copies) ---
     n = min(len(X), shap_matrix.shape[0])
-    shap_matrix = shap_matrix[:n, :]
-    X = X.iloc[:n, :]
+    shap_matrix = shap_matrix[:n]
+    X = X.iloc[:n]
 
     print(f"📈 Plotting SHAP dependence for '{feature_name}' — {model_name}")
 
@@ -115,8 +125,9 @@ def run_panel_regression(df: pd.DataFrame, y: str, X_vars: list, fe: str | None
     X_data = sm.add_constant(data[X_vars])
 
     if fe and fe in data.columns:
-        dummies = pd.get_dummies(data[fe], drop_first=True, prefix=fe)
-        X_data = pd.concat([pd.DataFrame(X_data), pd.DataFrame(dummies)], axis=1)
+        # Dense float dummies: statsmodels OLS needs a dense numeric design matrix
+        dummies = pd.get_dummies(data[fe], drop_first=True, prefix=fe, dtype=float)
+        X_data = pd.concat([X_data, dummies], axis=1)
 
     model = sm.OLS(y_data, X_data).fit()
     return model
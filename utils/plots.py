@@ -25,6 +25,10 @@ def plot_side_by_side(subset: pd.DataFrame, col_actual: str, col_model: str, ax,
     ax.xaxis.set_major_locator(mdates.YearLocator())
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
 
+def _split_by_region(df: pd.DataFrame) -> dict:
+    """{region: month-sorted subset}, built in one sort + groupby pass."""
+    return dict(tuple(df.sort_values("month").groupby("region", sort=False, observed=True)))
+
 # ===============================================================
 # Econometric model comparison (ARIMAX vs SARIMAX)
 # ===============================================================
@@ -32,8 +36,12 @@ def plot_side_by_side(subset: pd.DataFrame, col_actual: str, col_model: str, ax,
 def compare_econometric_models(df: pd.DataFrame, top_regions: list):
     """Plots ARIMAX vs SARIMAX for top EU countries."""
     plt.rcdefaults()
+    groups = _split_by_region(df)
     for country in top_regions:
-        subset = df.query("region == @country").sort_values("month")
+        subset = groups.get(country)
+        if subset is None:
+            print(f"⚠️ No data for {country}")
+            continue
         fig, axes = plt.subplots(1, 2, figsize=(14, 4), sharey=True)
         
         plot_side_by_side(subset, "log_nights_spent", "yhat_arimax", axes[0], f"ARIMAX vs Actual – {country}")
@@ -51,8 +59,12 @@ def compare_econometric_models(df: pd.DataFrame, top_regions: list):
 def compare_ml_models(df: pd.DataFrame, top_regions: list):
     """Plots XGBoost vs LightGBM for top EU countries."""
     plt.rcdefaults()
+    groups = _split_by_region(df)
     for c in top_regions:
-        subset = df.query("region == @c").sort_values("month")
+        subset = groups.get(c)
+        if subset is None:
+            print(f"⚠️ No data for {c}")
+            continue
         fig, axes = plt.subplots(1, 2, figsize=(14, 4), sharey=True)
 
         plot_side_by_side(subset, "log_nights_spent", "yhat_xgb", axes[0], f"XGBoost vs Actual – {c}")
@@ -32,6 +32,14 @@ __all__ = [
 ]
 
 
+# shock_type → case-insensitive substring identifying the shocked columns
+SHOCK_PATTERNS = {
+    "gdp": "log_gdp",
+    "turnover": "turnover_index",
+    "policy": "stringency",
+}
+
+
 # ===============================================================
 # APPLY MACRO SHOCK
 # ===============================================================
@@ -57,16 +65,13 @@ def apply_shock(df: pd.DataFrame, shock_type: str, shock_value: float) -> pd.Dat
 
     if shock_type == "none":
         return df_scen
-    elif shock_type == "gdp":
-        mask = df_scen.columns.str.contains("log_gdp", case=False)
-    elif shock_type == "turnover":
-        mask = df_scen.columns.str.contains("turnover_index", case=False)
-    elif shock_type == "policy":
-        mask = df_scen.columns.str.contains("stringency", case=False)
-    else:
+    if shock_type not in SHOCK_PATTERNS:
         raise ValueError(f"Unknown shock_type: {shock_type}")
 
-    df_scen.loc[:, mask] = df_scen.loc[:, mask].apply(lambda s: s * (1 + shock_value))
+    # One vectorized multiply over the whole block of shocked columns
+    pattern = SHOCK_PATTERNS[shock_type]
+    cols = [c for c in df_scen.columns if pattern in str(c).lower()]
+    df_scen[cols] = df_scen[cols] * (1 + shock_value)
     return df_scen
 
 
@@ -236,19 +241,18 @@ def calculate_impact(df_plot):
     pd.DataFrame
         impact_summary : mean % deviation by region (for optimistic and pessimistic scenarios)
     """
-    df_impact = df_plot.copy()[[
-        "region", "month",
-        "yhat_xgb", "yhat_xgb_optimistic_gdp", "yhat_xgb_pessimistic_gdp"
-    ]]
-
-    for col in ["yhat_xgb_optimistic_gdp", "yhat_xgb_pessimistic_gdp"]:
-        scen = col.replace("yhat_xgb_", "")
-        df_impact[f"{scen}_pct_diff"] = (
-            (df_impact[col] - df_impact["yhat_xgb"]) / df_impact["yhat_xgb"]
-        ) * 100
+    # Both scenarios in one (N, 2) array op against the baseline
+    base = df_plot["yhat_xgb"].to_numpy(dtype=float)[:, None]
+    scen = df_plot[["yhat_xgb_optimistic_gdp", "yhat_xgb_pessimistic_gdp"]].to_numpy(dtype=float)
+    pct = (scen - base) / base * 100
 
     impact_summary = (
-        df_impact.groupby("region")[["optimistic_gdp_pct_diff", "pessimistic_gdp_pct_diff"]]
+        pd.DataFrame(
+            pct,
+            index=pd.Index(df_plot["region"], name="region"),
+            columns=["optimistic_gdp_pct_diff", "pessimistic_gdp_pct_diff"],
+        )
+        .groupby(level=0)
         .mean()
         .sort_values("optimistic_gdp_pct_diff", ascending=False)
     )